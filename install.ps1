@@ -31,7 +31,7 @@ function Get-LatestVersion {
 function Get-TargetUrl {
     param([string]$Ver, [string]$Os, [string]$Arch)
     
-    $filename = "lazycelery-$Os-$Arch.zip"
+    $filename = "lazycelery-$Os-$Arch.exe.zip"
     return "https://github.com/$REPO/releases/download/v$Ver/$filename"
 }
 
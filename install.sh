@@ -47,14 +47,16 @@ detect_arch() {
 # Get latest version from GitHub API
 get_latest_version() {
     if command -v curl >/dev/null 2>&1; then
-        VERSION=$(curl -sSL https://api.github.com/repos/${REPO}/releases/latest | grep '"tag_name"' | cut -d'"' -f4 | cut -c2-)
+        TAG=$(curl -sSL https://api.github.com/repos/${REPO}/releases/latest | grep -F '"tag_name"' | cut -d'"' -f4)
     elif command -v wget >/dev/null 2>&1; then
-        VERSION=$(wget -qO- https://api.github.com/repos/${REPO}/releases/latest | grep '"tag_name"' | cut -d'"' -f4 | cut -c2-)
+        TAG=$(wget -qO- https://api.github.com/repos/${REPO}/releases/latest | grep -F '"tag_name"' | cut -d'"' -f4)
     else
         log_error "Neither curl nor wget found. Please install one of them."
         exit 1
     fi
     
+    VERSION=${TAG#v}
+    
     if [ -z "$VERSION" ]; then
         log_error "Could not fetch latest version"
         exit 1
@@ -79,7 +81,7 @@ install_binary() {
             FILENAME="lazycelery-macos-${ARCH}.tar.gz"
             ;;
         windows)
-            FILENAME="lazycelery-windows-${ARCH}.zip"
+            FILENAME="lazycelery-windows-${ARCH}.exe.zip"
             ;;
         *)
             log_error "Unsupported OS: ${OS}"
@@ -1,6 +1,11 @@
 #!/bin/sh
 # Version Validation Script for LazyCelery
 # Validates that all version references are consistent across project files
+#
+# Results are cached in .cache/validate-versions.stamp, which records the
+# modification time of every input file; the checks are skipped while that
+# listing is unchanged, so edited, added, removed or backdated files all
+# trigger a rerun. Set VALIDATE_VERSIONS_FORCE=true to always run them.
 
 set -e
 
@@ -13,40 +18,102 @@ log_info() { printf "${GREEN}[INFO]${NC} %s\n" "$1"; }
 log_warn() { printf "${YELLOW}[WARN]${NC} %s\n" "$1" >&2; }
 log_error() { printf "${RED}[ERROR]${NC} %s\n" "$1" >&2; }
 
+# Print string values from a TOML table in a single pass, one line per key
+# in argument order: toml_get <file> <table> <key>...
+toml_get() {
+    toml_file=$1
+    toml_table=$2
+    shift 2
+    awk -v table="[$toml_table]" -v keys="$*" '
+        BEGIN { n = split(keys, names, " ") }
+        /^\[/ { in_table = ($0 == table); next }
+        in_table && /^[A-Za-z0-9_-]+[ \t]*=/ {
+            key = $0
+            sub(/[ \t]*=.*$/, "", key)
+            if (key in values) next
+            value = $0
+            sub(/^[^=]*=[ \t]*"/, "", value)
+            sub(/".*$/, "", value)
+            values[key] = value
+        }
+        END { for (i = 1; i <= n; i++) print values[names[i]] }
+    ' "$toml_file"
+}
+
+# Version formats accepted by the checks below
+SEMVER_PATTERN='^[0-9]+\.[0-9]+\.[0-9]+(-[0-9A-Za-z.-]+)?(\+[0-9A-Za-z.-]+)?$'
+DOCKER_RUST_SED='/FROM.*[[:space:]/]rust:/{s/.*rust:\([0-9.]*\).*/\1/p;q;}'
+
+# Package templates rendered by the release workflow
+PACKAGE_TEMPLATES="packaging/homebrew/lazycelery.rb packaging/scoop/lazycelery.json"
+
+# Per-file mtimes of the last successful run and the files it covers
+STAMP_FILE=".cache/validate-versions.stamp"
+STAMP_INPUTS="Cargo.toml .mise.toml Dockerfile packaging scripts/validate-versions.sh"
+VALIDATE_VERSIONS_FORCE="${VALIDATE_VERSIONS_FORCE:-false}"
+
+# Print "<mtime> <path>" for every input file, sorted by path (GNU stat,
+# falling back to the BSD/macOS flags)
+input_mtimes() {
+    find $STAMP_INPUTS -type f 2>/dev/null | sort | while IFS= read -r input; do
+        stat -c '%Y %n' "$input" 2>/dev/null || stat -f '%m %N' "$input"
+    done
+}
+
 PROJECT_ROOT="$(cd "$(dirname "$0")/.." && pwd)"
 cd "$PROJECT_ROOT"
 
 ERRORS=0
 
+# Skip the checks when no input changed since the last successful run
+INPUT_MTIMES=$(input_mtimes)
+if [ "$VALIDATE_VERSIONS_FORCE" != "true" ] && [ -f "$STAMP_FILE" ] &&
+    [ "$INPUT_MTIMES" = "$(cat "$STAMP_FILE")" ]; then
+    log_info "No inputs changed since the last successful run, skipping (cached)"
+    exit 0
+fi
+
+# Record the mtimes seen before the checks so edits made during the run
+# invalidate the stamp
+mkdir -p "$(dirname "$STAMP_FILE")"
+printf '%s\n' "$INPUT_MTIMES" > "$STAMP_FILE.new"
+trap 'rm -f "$STAMP_FILE.new"' EXIT
+
 log_info "Validating version consistency..."
 
-# Get version from Cargo.toml
-CARGO_VERSION=$(grep '^version = ' Cargo.toml | sed 's/version = "\(.*\)"/\1/')
+# Get version, rust-version and name from Cargo.toml in one read
+{ read -r CARGO_VERSION; read -r CARGO_RUST_VERSION || :; read -r CARGO_NAME || :; } <<EOF
+$(toml_get Cargo.toml package version rust-version name)
+EOF
 
 if [ -z "$CARGO_VERSION" ]; then
     log_error "Could not determine version from Cargo.toml"
     exit 1
 fi
 
+if ! printf '%s\n' "$CARGO_VERSION" | grep -Eq "$SEMVER_PATTERN"; then
+    log_error "Cargo.toml version is not valid semver: $CARGO_VERSION"
+    exit 1
+fi
+
 log_info "Cargo.toml version: $CARGO_VERSION"
-DOCKER_RUST=$(grep 'FROM rust:' Dockerfile | sed 's/.*rust:\([0-9.]*\).*/\1/')
 # Check .mise.toml rust version
-MISE_RUST=$(grep '^rust = ' .mise.toml | sed 's/rust = "\(.*\)"/\1/')
+MISE_RUST=$(toml_get .mise.toml tools rust)
 
 if [ -n "$MISE_RUST" ]; then
     log_info ".mise.toml Rust: $MISE_RUST"
 fi
 
 # Check Dockerfile rust version
-DOCKER_RUST=$(grep 'FROM rust:' Dockerfile | sed 's/.*rust:\([0-9.]*\).*/\1/')
+DOCKER_RUST=$(sed -n "$DOCKER_RUST_SED" Dockerfile)
 
 if [ -n "$DOCKER_RUST" ]; then
     log_info "Dockerfile Rust: $DOCKER_RUST"
+else
+    log_warn "Could not find a rust: base image in Dockerfile, skipping its check"
 fi
 
 # Validate rust-version in Cargo.toml matches mise.toml
-CARGO_RUST_VERSION=$(grep '^rust-version = ' Cargo.toml | sed 's/rust-version = "\(.*\)"/\1/')
-
 if [ -n "$CARGO_RUST_VERSION" ]; then
     log_info "Cargo.toml rust-version: $CARGO_RUST_VERSION"
     
@@ -61,15 +128,75 @@ if [ -n "$CARGO_RUST_VERSION" ]; then
     fi
 fi
 
-# Check for placeholder hashes (warnings only)
-if grep -r "PLACEHOLDER_SHA256" packaging/ >/dev/null 2>&1; then
-    log_warn "Found PLACEHOLDER_SHA256 in packaging files (expected for development)"
+# Scan every file under packaging/ once for placeholder hashes, and check
+# that each template the release workflow renders has its VERSION sentinel
+# (file names are read from stdin, so an empty directory cannot leave awk
+# waiting on the terminal and names with spaces stay intact)
+TEMPLATE_SCAN=$(find packaging -type f | awk -v templates="$PACKAGE_TEMPLATES" '
+    {
+        file = $0
+        while ((getline line < file) > 0) {
+            if (index(line, "VERSION")) has_version[file] = 1
+            if (index(line, "PLACEHOLDER_SHA256") && !(file in has_placeholder)) {
+                has_placeholder[file] = 1
+                print "placeholder " file
+            }
+        }
+        close(file)
+    }
+    END {
+        n = split(templates, names, " ")
+        for (i = 1; i <= n; i++) {
+            if (!(names[i] in has_version)) print "missing " names[i]
+        }
+    }
+')
+
+PLACEHOLDER_FILES=""
+while read -r kind file; do
+    case "$kind" in
+        missing)
+            log_error "No VERSION placeholder in $file"
+            ERRORS=$((ERRORS + 1))
+            ;;
+        placeholder)
+            PLACEHOLDER_FILES="$PLACEHOLDER_FILES
+$file"
+            ;;
+    esac
+done <<EOF
+$TEMPLATE_SCAN
+EOF
+
+# Homebrew requires the formula class to be the package name in CamelCase,
+# splitting on "-", "_" and "."
+if [ -n "$CARGO_NAME" ]; then
+    FORMULA_CLASS=$(printf '%s\n' "$CARGO_NAME" | awk -F '[-_.]' '{
+        for (i = 1; i <= NF; i++) printf "%s%s", toupper(substr($i, 1, 1)), tolower(substr($i, 2))
+    }')
+
+    if ! grep -qF "class $FORMULA_CLASS < Formula" packaging/homebrew/lazycelery.rb; then
+        log_error "Homebrew formula class should be $FORMULA_CLASS for package $CARGO_NAME"
+        ERRORS=$((ERRORS + 1))
+    fi
+fi
+
+# Placeholder hashes are warnings only
+if [ -n "$PLACEHOLDER_FILES" ]; then
+    log_warn "Found PLACEHOLDER_SHA256 in packaging files (expected for development):"
+    while read -r file; do
+        [ -n "$file" ] && log_warn "  $file"
+    done <<EOF
+$PLACEHOLDER_FILES
+EOF
 fi
 
 if [ $ERRORS -eq 0 ]; then
+    mv "$STAMP_FILE.new" "$STAMP_FILE"
     log_info "All version checks passed!"
     exit 0
 else
+    rm -f "$STAMP_FILE.new" "$STAMP_FILE"
     log_error "Found $ERRORS version inconsistencies"
     exit 1
 fi